@@ -4,155 +4,472 @@ Convert MP4 files to M4A (audio only) in parallel with progress tracking.
 """
 
 import argparse
+import asyncio
+import contextlib
+import functools
+import json
 import os
-import subprocess
+import signal
 import sys
+import tempfile
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class _NullBar:
+    """Stand-in for tqdm when it isn't installed: no bars, messages still print."""
+
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+    def update(self, n: int = 1):
+        """Ignore progress updates."""
+
+    def set_description(self, desc: str = ""):
+        """Ignore description changes."""
+
+    def close(self):
+        """Nothing to clean up."""
+
+    @staticmethod
+    def write(message: str):
+        """Print a message."""
+        print(message)
+
 
 try:
     from tqdm import tqdm
 except ImportError:
-    print("📦 Installing required package: tqdm")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "tqdm"])
-    from tqdm import tqdm
+    print("⚠️  tqdm not installed - progress bars disabled (pip install tqdm)")
+    tqdm = _NullBar  # pylint: disable=invalid-name
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+CACHE_DIR = CACHE_HOME / "mp4-to-m4a"
+MEDIA_CACHE_FILE = CACHE_DIR / "media.json"
+PENDING_DELETES_FILE = CACHE_DIR / "pending_deletes.txt"
+
+
+class ConversionOptions(NamedTuple):
+    """Settings shared by every conversion in a run."""
+
+    dry_run: bool = False
+    threads_n: int = 1
+    use_cache: bool = True
+    probe_timeout: float = 5.0
+    force_reencode: bool = False
+
+
+class MediaInfo(NamedTuple):
+    """What ffprobe reports about a source file."""
+
+    duration: Optional[float] = None
+    audio_codec: Optional[str] = None
+
+
+def _cgroup_cpu_limit() -> Optional[int]:
+    """Get the CPU quota imposed by cgroup v2 (e.g. a container limit), if any."""
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text(encoding="utf-8").split()
+        if quota == "max":
+            return None
+        return max(1, -(-int(quota) // int(period)))
+    except (OSError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _available_cpu_count() -> int:
+    """Get the number of CPUs this process may actually run on."""
+    if hasattr(os, "sched_getaffinity"):
+        # Respects taskset / cpuset pinning, unlike os.cpu_count()
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 4
+    limit = _cgroup_cpu_limit()
+    return min(count, limit) if limit else count
 
 
 def get_cpu_count(num_files: int) -> int:
-    """Get the number of CPU cores."""
+    """Get the number of parallel workers, bounded by CPU cores and file count."""
+    # Never spawn more ffmpeg processes than there are cores: one process per
+    # file on a large directory freezes the system under context switching and
+    # memory pressure. Combined with -threads, workers * threads ~= cpu_count.
+    return min(_available_cpu_count(), max(1, num_files))
+
+
+def _ffmpeg_threads_per_invocation(n_workers: int) -> int:
+    """Get the number of threads each ffmpeg process may use without oversubscribing."""
+    return max(1, _available_cpu_count() // max(1, n_workers))
+
+
+def _ffprobe_args(file_path: Path) -> List[str]:
+    """Build the ffprobe command line for a file's duration and audio codec."""
+    return [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-read_intervals",
+        "%+1",
+        "-show_entries",
+        "format=duration:stream=codec_name",
+        "-of",
+        "json",
+        str(file_path),
+    ]
+
+
+def _parse_probe_output(output: str) -> Optional[MediaInfo]:
+    """Parse ffprobe's JSON output."""
     try:
-        # macOS
-        result = subprocess.run(
-            ["sysctl", "-n", "hw.ncpu"], capture_output=True, text=True, check=True
-        )
-        return max(int(result.stdout.strip()), num_files)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fallback to Python's os module
-        return max(os.cpu_count() or 4, num_files)
+        data = json.loads(output)
+        streams = data.get("streams") or [{}]
+        audio_codec = streams[0].get("codec_name")
+        duration = data.get("format", {}).get("duration")
+    except (ValueError, AttributeError):
+        return None
+    try:
+        # Streams without a known length report "N/A"; keep the codec anyway
+        duration = float(duration) if duration else None
+    except (TypeError, ValueError):
+        duration = None
+    return MediaInfo(duration=duration, audio_codec=audio_codec)
+
+
+async def _probe_media_async(
+    file_path: Path, timeout: float, semaphore: asyncio.Semaphore
+) -> Optional[MediaInfo]:
+    """Get the duration and audio codec of a media file using ffprobe."""
+    async with semaphore:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *_ffprobe_args(file_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if process.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+
+    if process.returncode == 0 and stdout.strip():
+        return _parse_probe_output(stdout.decode(errors="replace"))
+    return None
 
 
-def get_media_duration(file_path: Path) -> Optional[float]:
-    """Get the duration of a media file in seconds using ffprobe."""
+def _media_cache_key(file_path: Path) -> Optional[str]:
+    """Build a cache key that changes whenever the file is modified."""
     try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(file_path),
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-    except (ValueError, FileNotFoundError):
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return f"{file_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _load_media_cache() -> Dict[str, dict]:
+    """Load cached probe results from disk, ignoring a missing or corrupt cache."""
+    try:
+        cache = json.loads(MEDIA_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _is_live_cache_key(key: str) -> bool:
+    """Check whether a cache key still describes a file on disk, unmodified."""
+    path = key.rsplit(":", 2)[0]
+    return _media_cache_key(Path(path)) == key
+
+
+@contextlib.contextmanager
+def _locked(path: Path):
+    """Hold an exclusive lock on a state file's sibling .lock file, if supported."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix(".lock"), "w", encoding="utf-8") as lock_file:
+        # Serialize concurrent runs so neither drops the other's entries
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _save_media_cache(entries: Dict[str, dict]):
+    """Merge new probe results into the on-disk cache with an atomic replace."""
+    if not entries:
+        return
+    try:
+        with _locked(MEDIA_CACHE_FILE):
+            cache = _load_media_cache()
+            cache.update(entries)
+            # Converted sources are deleted, so prune entries that can never hit
+            cache = {
+                key: value for key, value in cache.items() if _is_live_cache_key(key)
+            }
+            with tempfile.NamedTemporaryFile(
+                "w", dir=CACHE_DIR, suffix=".tmp", delete=False, encoding="utf-8"
+            ) as tmp_file:
+                json.dump(cache, tmp_file)
+            os.replace(tmp_file.name, MEDIA_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _record_pending_delete(mp4_path: Path):
+    """Journal a converted source so it is deleted even if this run is killed."""
+    try:
+        with _locked(PENDING_DELETES_FILE):
+            with open(PENDING_DELETES_FILE, "a", encoding="utf-8") as journal:
+                journal.write(f"{mp4_path.resolve()}\n")
+    except OSError:
+        pass
+
+
+def _delete_pending_sources():
+    """Delete sources journaled by earlier runs that never got to remove them."""
+    try:
+        with _locked(PENDING_DELETES_FILE):
+            try:
+                lines = PENDING_DELETES_FILE.read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                return
+            for line in filter(None, lines):
+                mp4_path = Path(line)
+                # Journaled just before the rename; only trust finished outputs
+                if mp4_path.exists() and mp4_path.with_suffix(".m4a").exists():
+                    _delete_sources([mp4_path])
+            os.unlink(PENDING_DELETES_FILE)
+    except OSError:
         pass
-    return None
 
 
-def _simulate_dry_run(
-    filename: str, position: int, start_time: float
+def _media_info_from_cache(entry) -> Optional[MediaInfo]:
+    """Rebuild a cached probe result, or None if the entry is malformed."""
+    if not isinstance(entry, dict):
+        return None
+    duration = entry.get("duration")
+    audio_codec = entry.get("audio_codec")
+    if isinstance(duration, bool) or not isinstance(duration, (int, float, type(None))):
+        return None
+    if not isinstance(audio_codec, (str, type(None))):
+        return None
+    return MediaInfo(duration, audio_codec)
+
+
+async def _probe_all_media(
+    paths: List[Path], num_workers: int, options: ConversionOptions
+) -> Dict[Path, MediaInfo]:
+    """Probe all files up front, overlapping the ffprobe forks."""
+    media = {}
+    keys = {}
+    cache = {}
+    if options.use_cache:
+        keys = {path: _media_cache_key(path) for path in paths}
+        cache = _load_media_cache()
+
+    to_probe = []
+    for path in paths:
+        info = _media_info_from_cache(cache.get(keys.get(path)))
+        if info is not None:
+            media[path] = info
+        else:
+            to_probe.append(path)
+
+    new_entries = {}
+    semaphore = asyncio.Semaphore(num_workers)
+    results = await asyncio.gather(
+        *(
+            _probe_media_async(path, options.probe_timeout, semaphore)
+            for path in to_probe
+        )
+    )
+    for path, info in zip(to_probe, results):
+        if info is not None:
+            media[path] = info
+            if keys.get(path):
+                new_entries[keys[path]] = info._asdict()
+
+    _save_media_cache(new_entries)
+    return media
+
+
+async def _simulate_dry_run(
+    filename: str, desc: str, position: int, start_time: float
 ) -> Tuple[bool, str, str, float]:
     """Simulate file conversion in dry-run mode."""
     with tqdm(
         total=100,
-        desc=f"🔄 {filename[:40]}",
+        desc=desc,
         unit="%",
         position=position,
         leave=False,
     ) as pbar:
         for _ in range(100):
-            time.sleep(0.005)
+            await asyncio.sleep(0.005)
             pbar.update(1)
     duration = time.time() - start_time
     return True, filename, "", duration
 
 
-def _create_progress_bar(filename: str, position: int, total_duration: Optional[float]):
+def _create_progress_bar(desc: str, position: int, total_duration: Optional[float]):
     """Create a progress bar based on whether duration is available."""
     if total_duration:
         return tqdm(
             total=100,
-            desc=f"🔄 {filename[:40]}",
+            desc=desc,
             unit="%",
             position=position,
             leave=False,
         )
     return tqdm(
-        desc=f"🔄 {filename[:40]}",
+        desc=desc,
         position=position,
         leave=False,
         bar_format="{desc}: {elapsed}",
     )
 
 
-def _parse_ffmpeg_progress(process, pbar, total_duration: Optional[float]) -> list:
-    """Parse ffmpeg progress output and update progress bar."""
-    error_output = []
-    last_progress = 0
-
-    for line in process.stderr:
-        line = line.strip()
-
-        if line and not line.startswith("out_time_ms=") and "=" not in line:
-            error_output.append(line)
-
-        if total_duration and line.startswith("out_time_ms="):
-            try:
-                time_ms = int(line.split("=")[1])
-                current_seconds = time_ms / 1_000_000
-                progress_pct = min(100, int((current_seconds / total_duration) * 100))
-
-                if progress_pct > last_progress:
-                    pbar.update(progress_pct - last_progress)
-                    last_progress = progress_pct
-            except (ValueError, IndexError):
-                pass
+# Despite its name ffmpeg's out_time_ms is also in microseconds; out_time_us
+# is the correctly named key
+PROGRESS_KEY = b"out_time_us="
+PROGRESS_UPDATE_INTERVAL = 0.25
 
-    return error_output
 
-
-def _run_ffmpeg_conversion(
-    mp4_path: Path, m4a_path: Path, pbar, total_duration: Optional[float]
+async def _parse_ffmpeg_progress(stdout, pbar, total_duration: Optional[float]):
+    """Parse ffmpeg progress output from stdout and update progress bar."""
+    buf = b""
+    last_progress = 0
+    pending = 0
+    last_update_t = time.monotonic()
+
+    while chunk := await stdout.read(4096):
+        buf += chunk
+        # Only the most recent complete progress value matters for the bar
+        idx = buf.rfind(PROGRESS_KEY)
+        if idx == -1:
+            buf = buf[-len(PROGRESS_KEY) :]
+            continue
+        end = buf.find(b"\n", idx)
+        if end == -1:
+            buf = buf[idx:]
+            continue
+        value = buf[idx + len(PROGRESS_KEY) : end]
+        buf = buf[end + 1 :]
+
+        if not total_duration:
+            continue
+        try:
+            current_seconds = int(value) / 1_000_000
+        except ValueError:
+            continue
+        progress_pct = min(100, int((current_seconds / total_duration) * 100))
+
+        if progress_pct <= last_progress:
+            continue
+        pending += progress_pct - last_progress
+        last_progress = progress_pct
+
+        # Coalesce bar redraws, which all workers serialize on tqdm's lock
+        now = time.monotonic()
+        if progress_pct == 100 or now - last_update_t >= PROGRESS_UPDATE_INTERVAL:
+            pbar.update(pending)
+            pending = 0
+            last_update_t = now
+
+    if pending:
+        pbar.update(pending)
+
+
+def _build_ffmpeg_args(
+    mp4_path: Path,
+    output_path: Path,
+    media_info: MediaInfo,
+    options: ConversionOptions,
+) -> List[str]:
+    """Build the ffmpeg command line, remuxing instead of re-encoding if possible."""
+    threads_n = options.threads_n
+    # AAC audio can simply be remuxed into the M4A container
+    if media_info.audio_codec == "aac" and not options.force_reencode:
+        audio_codec = ["-c:a", "copy"]
+    else:
+        audio_codec = ["-c:a", "aac", "-q:a", "2"]
+    return [
+        "ffmpeg",
+        "-y",
+        "-threads",
+        str(threads_n),
+        "-i",
+        str(mp4_path),
+        "-threads",
+        str(threads_n),
+        # Only the probed audio stream: video and data tracks are never opened
+        "-map",
+        "0:a:0",
+        "-vn",
+        *audio_codec,
+        "-progress",
+        "pipe:1",
+        "-nostats",
+        "-loglevel",
+        "error",
+        # The output name doesn't end in .m4a, so name the M4A muxer explicitly
+        "-f",
+        "ipod",
+        str(output_path),
+    ]
+
+
+async def _run_ffmpeg_conversion(
+    ffmpeg_args: List[str], pbar, total_duration: Optional[float]
 ) -> Tuple[int, list]:
     """Run ffmpeg conversion process."""
-    with subprocess.Popen(
-        [
-            "ffmpeg",
-            "-i",
-            str(mp4_path),
-            "-vn",
-            "-c:a",
-            "aac",
-            "-q:a",
-            "2",
-            "-progress",
-            "pipe:2",
-            "-nostats",
-            "-loglevel",
-            "error",
-            str(m4a_path),
-        ],
-        stderr=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        text=True,
-    ) as process:
-        error_output = _parse_ffmpeg_progress(process, pbar, total_duration)
-        process.wait()
-        return process.returncode, error_output
-
-
-def convert_file(
-    mp4_path: Path, dry_run: bool = False, position: int = 0
+    process = await asyncio.create_subprocess_exec(
+        *ffmpeg_args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        # Drain stderr alongside progress so ffmpeg never blocks on a full pipe
+        _, errors = await asyncio.gather(
+            _parse_ffmpeg_progress(process.stdout, pbar, total_duration),
+            process.stderr.read(),
+        )
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+
+    errors = errors.decode(errors="replace")
+    error_output = [line.strip() for line in errors.splitlines() if line.strip()]
+    return process.returncode, error_output
+
+
+async def convert_file(
+    mp4_path: Path,
+    options: ConversionOptions,
+    position: int = 0,
+    media_info: Optional[MediaInfo] = None,
 ) -> Tuple[bool, str, str, float]:
     """
     Convert a single MP4 file to M4A with individual progress bar.
@@ -162,18 +479,24 @@ def convert_file(
     """
     start_time = time.time()
     filename = mp4_path.name
+    desc = "🔄 " + filename[:40]
 
     try:
-        if dry_run:
-            return _simulate_dry_run(filename, position, start_time)
+        if options.dry_run:
+            return await _simulate_dry_run(filename, desc, position, start_time)
 
+        media_info = media_info or MediaInfo()
         m4a_path = mp4_path.with_suffix(".m4a")
-        total_duration = get_media_duration(mp4_path)
-        pbar = _create_progress_bar(filename, position, total_duration)
+        # Write to a temporary name so an interrupted run never leaves a
+        # partial file that looks like a finished conversion
+        part_path = m4a_path.with_name(m4a_path.name + ".part")
+        pbar = _create_progress_bar(desc, position, media_info.duration)
 
         try:
-            returncode, error_output = _run_ffmpeg_conversion(
-                mp4_path, m4a_path, pbar, total_duration
+            returncode, error_output = await _run_ffmpeg_conversion(
+                _build_ffmpeg_args(mp4_path, part_path, media_info, options),
+                pbar,
+                media_info.duration,
             )
             pbar.close()
 
@@ -183,20 +506,28 @@ def convert_file(
                 error_msg = "\n".join(error_output) if error_output else "FFmpeg error"
                 return False, filename, f"FFmpeg error: {error_msg}", duration
 
-            mp4_path.unlink()
+            _record_pending_delete(mp4_path)
+            os.replace(part_path, m4a_path)
             return True, filename, "", duration
 
         finally:
-            if pbar:
-                pbar.close()
+            pbar.close()
+            with contextlib.suppress(FileNotFoundError):
+                part_path.unlink()
 
-    except (OSError, subprocess.SubprocessError, ValueError) as e:
+    except (OSError, ValueError) as e:
         duration = time.time() - start_time
         return False, filename, str(e), duration
 
 
 def format_time(seconds: float) -> str:
     """Format seconds into a human-readable string."""
+    return _format_rounded_time(round(seconds, 3))
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_rounded_time(seconds: float) -> str:
+    """Format seconds, rounded to the millisecond so results can be cached."""
     if seconds < 1:
         return f"{seconds * 1000:.0f}ms"
     if seconds < 60:
@@ -205,7 +536,7 @@ def format_time(seconds: float) -> str:
 
 
 def _get_mp4_files(dry_run: bool) -> list:
-    """Find MP4 files or create simulated ones in dry-run mode."""
+    """Find MP4 files still to convert, or create simulated ones in dry-run mode."""
     mp4_files = list(Path.cwd().glob("*.mp4"))
 
     if not mp4_files:
@@ -215,19 +546,57 @@ def _get_mp4_files(dry_run: bool) -> list:
         print("⚠️  No MP4 files found - creating simulated files for demonstration\n")
         return [Path(f"sample_video_{i}.mp4") for i in range(1, 6)]
 
-    return mp4_files
+    # Resume an interrupted run: outputs only appear once fully written, so an
+    # existing M4A means the file is done and needn't be probed or converted
+    pending = [path for path in mp4_files if not path.with_suffix(".m4a").exists()]
+    skipped = len(mp4_files) - len(pending)
+    if not pending:
+        print(f"✅ All {skipped} MP4 file(s) already have an M4A - nothing to do")
+    elif skipped:
+        print(f"⏭️  Skipping {skipped} file(s) that already have an M4A\n")
+
+    return pending
+
+
+async def _convert_when_ready(
+    slots: asyncio.Queue,
+    mp4_path: Path,
+    options: ConversionOptions,
+    media_info: Optional[MediaInfo],
+    converted: list,
+) -> Tuple[bool, str, str, float]:
+    """Wait for a free worker slot, then convert the file on that slot's bar line."""
+    position = await slots.get()
+    try:
+        result = await convert_file(mp4_path, options, position, media_info)
+    finally:
+        slots.put_nowait(position)
+    # Recorded as soon as the output is in place, so an interrupt can't lose it
+    if result[0]:
+        converted.append(mp4_path)
+    return result
 
 
 def _submit_conversion_tasks(
-    executor, mp4_files: list, num_workers: int, dry_run: bool
-) -> dict:
-    """Submit all conversion tasks to the executor."""
-    futures = {}
-    for idx, mp4_file in enumerate(mp4_files):
-        position = (idx % num_workers) + 1
-        future = executor.submit(convert_file, mp4_file, dry_run, position)
-        futures[future] = mp4_file
-    return futures
+    mp4_files: list,
+    num_workers: int,
+    options: ConversionOptions,
+    media: Dict[Path, MediaInfo],
+    converted: list,
+) -> list:
+    """Schedule all conversion tasks on the running event loop."""
+    # Each free slot is a progress bar line; holding one is what limits concurrency
+    slots = asyncio.Queue()
+    for position in range(1, num_workers + 1):
+        slots.put_nowait(position)
+
+    tasks = []
+    for mp4_file in mp4_files:
+        coro = _convert_when_ready(
+            slots, mp4_file, options, media.get(mp4_file), converted
+        )
+        tasks.append(asyncio.ensure_future(coro))
+    return tasks
 
 
 def _handle_conversion_result(
@@ -240,43 +609,78 @@ def _handle_conversion_result(
     """Handle a single conversion result."""
     success, filename, error_msg, duration = result_tuple
     file_times[filename] = duration
+    elapsed = f"({format_time(duration)})"
 
     if success:
         successful.append(filename)
-        overall_pbar.write(f"✅ {filename} ({format_time(duration)})")
+        overall_pbar.write(f"✅ {filename} {elapsed}")
     else:
         failed.append((filename, error_msg))
-        overall_pbar.write(f"❌ {filename}: {error_msg} ({format_time(duration)})")
+        overall_pbar.write(f"❌ {filename}: {error_msg} {elapsed}")
 
 
-def _process_conversions(
-    mp4_files: list, num_workers: int, dry_run: bool
+async def _process_conversions(
+    mp4_files: list, num_workers: int, options: ConversionOptions, converted: list
 ) -> Tuple[list, list, dict]:
-    """Process file conversions in parallel."""
+    """Process file conversions in parallel, appending finished sources to converted."""
     successful = []
     failed = []
     file_times = {}
+    media = {}
+    if not options.dry_run:
+        media = await _probe_all_media(mp4_files, num_workers, options)
+    # Longest files first so a long file starting last can't stretch the makespan
+    mp4_files = sorted(
+        mp4_files, key=lambda path: -(media.get(path, MediaInfo()).duration or 0)
+    )
+
+    tasks = _submit_conversion_tasks(mp4_files, num_workers, options, media, converted)
 
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        futures = _submit_conversion_tasks(executor, mp4_files, num_workers, dry_run)
-
-        with tqdm(
-            total=len(mp4_files),
-            desc="📊 Overall",
-            unit="file",
-            position=0,
-            leave=True,
-        ) as overall_pbar:
-            for future in as_completed(futures):
-                result = future.result()
-                _handle_conversion_result(
-                    result, overall_pbar, successful, failed, file_times
-                )
-                overall_pbar.update(1)
+    with tqdm(
+        total=len(mp4_files),
+        desc="📊 Overall",
+        unit="file",
+        position=0,
+        leave=True,
+    ) as overall_pbar:
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            _handle_conversion_result(
+                result, overall_pbar, successful, failed, file_times
+            )
+            overall_pbar.update(1)
 
     return successful, failed, file_times
 
 
+def _delete_sources(converted: list):
+    """Delete the source MP4s of successful conversions in a single pass."""
+    for mp4_file in converted:
+        try:
+            os.unlink(mp4_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️  Could not delete {mp4_file.name}: {e}")
+
+
+def _time_stats(
+    successful: list, file_times: dict
+) -> Tuple[float, Tuple[float, str], Tuple[float, str]]:
+    """Get the average, fastest and slowest conversion times in a single pass."""
+    total = 0.0
+    fastest = (float("inf"), "")
+    slowest = (float("-inf"), "")
+    for filename in successful:
+        file_time = file_times[filename]
+        total += file_time
+        if file_time < fastest[0]:
+            fastest = (file_time, filename)
+        if file_time > slowest[0]:
+            slowest = (file_time, filename)
+    return total / len(successful), fastest, slowest
+
+
 def _print_summary(
     successful: list,
     failed: list,
@@ -292,9 +696,7 @@ def _print_summary(
     print(f"   ⏱️  Total time: {format_time(overall_duration)}")
 
     if successful:
-        avg_time = sum(file_times[f] for f in successful) / len(successful)
-        fastest = min((file_times[f], f) for f in successful)
-        slowest = max((file_times[f], f) for f in successful)
+        avg_time, fastest, slowest = _time_stats(successful, file_times)
         print(f"   📈 Avg time per file: {format_time(avg_time)}")
         print(f"   🐇 Fastest: {fastest[1]} ({format_time(fastest[0])})")
         print(f"   🐢 Slowest: {slowest[1]} ({format_time(slowest[0])})")
@@ -310,6 +712,33 @@ def _print_summary(
             print(f"   • {filename}: {error}")
 
 
+def _ffmpeg_threads_arg(value: str) -> int:
+    """Validate the --ffmpeg-threads argument."""
+    try:
+        threads_n = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from e
+    if not 1 <= threads_n <= 64:
+        raise argparse.ArgumentTypeError("must be between 1 and 64")
+    return threads_n
+
+
+def _probe_timeout_arg(value: str) -> float:
+    """Validate the --probe-timeout argument."""
+    try:
+        timeout = float(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from e
+    if timeout <= 0:
+        raise argparse.ArgumentTypeError("must be greater than 0")
+    return timeout
+
+
+def _exit_on_sigterm(signum, _frame):
+    """Turn SIGTERM into SystemExit so cleanup in finally blocks still runs."""
+    raise SystemExit(128 + signum)
+
+
 def main():
     """Main conversion process."""
     parser = argparse.ArgumentParser(
@@ -320,26 +749,70 @@ def main():
         action="store_true",
         help="Simulate conversion without actually processing files",
     )
+    parser.add_argument(
+        "--ffmpeg-threads",
+        type=_ffmpeg_threads_arg,
+        default=None,
+        metavar="N",
+        help="Threads per ffmpeg process (1-64, default: CPU cores / workers)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-probe every file instead of using cached probe results",
+    )
+    parser.add_argument(
+        "--probe-timeout",
+        type=_probe_timeout_arg,
+        default=5.0,
+        metavar="SECONDS",
+        help="Give up probing a file's duration after this long (default: 5)",
+    )
+    parser.add_argument(
+        "--force-reencode",
+        action="store_true",
+        help="Always re-encode to AAC, even if the source audio is already AAC",
+    )
     args = parser.parse_args()
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
 
+    if not args.dry_run:
+        _delete_pending_sources()
     mp4_files = _get_mp4_files(args.dry_run)
     if not mp4_files:
         return 0
 
     num_workers = get_cpu_count(len(mp4_files))
+    threads_n = args.ffmpeg_threads or _ffmpeg_threads_per_invocation(num_workers)
 
     if args.dry_run:
         print("🧪 DRY RUN MODE - No files will be converted or deleted")
         print(f"   CPU cores detected: {num_workers}\n")
 
     print(f"🎬 Found {len(mp4_files)} MP4 file(s) to convert")
-    print(f"🚀 Using {num_workers} parallel workers\n")
+    print(f"🚀 Using {num_workers} parallel workers")
+    print(f"🧵 Using {threads_n} ffmpeg thread(s) per worker\n")
     print("Starting conversions...\n")
 
     overall_start = time.time()
-    successful, failed, file_times = _process_conversions(
-        mp4_files, num_workers, args.dry_run
+    options = ConversionOptions(
+        dry_run=args.dry_run,
+        threads_n=threads_n,
+        use_cache=not args.no_cache,
+        probe_timeout=args.probe_timeout,
+        force_reencode=args.force_reencode,
     )
+    converted = []
+    try:
+        successful, failed, file_times = asyncio.run(
+            _process_conversions(mp4_files, num_workers, options, converted)
+        )
+    finally:
+        # Deleting after all encodes finish keeps metadata writes off their I/O
+        # path. This also runs on Ctrl+C / SIGTERM; anything a harder kill
+        # strands is left in the pending-delete journal for the next run
+        if not args.dry_run:
+            _delete_sources(converted)
     overall_duration = time.time() - overall_start
 
     _print_summary(successful, failed, file_times, overall_duration, args.dry_run)